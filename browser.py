@@ -1,32 +1,259 @@
 import socket
 import ssl
 import sys
-import gzip
+import zlib
+import collections
 from dns_resolver import resolve
 from renderer import Browser
 
+# Optional: libdeflate bindings (pip install deflate) decode gzip roughly
+# twice as fast as zlib and use SIMD-accelerated CRC. Fall back to zlib.
+try:
+    import deflate as _libdeflate
+except ImportError:
+    _libdeflate = None
 
-def decode_chunked(data):
-    """Decode HTTP chunked transfer encoding."""
-    result = b""
-    while data:
-        crlf = data.find(b"\r\n")
+
+def decode_chunked(data, decompressor=None):
+    """
+    Decode HTTP chunked transfer encoding.
+
+    IMPROVEMENT: accumulates into a bytearray and walks the input with an
+    integer offset over a memoryview instead of repeatedly reslicing the
+    bytes object — the old `result += ...` / `data = data[...:]` pattern
+    copied the remaining body on every chunk (O(N²) for large responses).
+
+    If `decompressor` is given (a zlib.decompressobj), each chunk is fed
+    through it as it is decoded, so a gzipped chunked body is reassembled
+    and decompressed in a single pass instead of being buffered twice.
+    """
+    result = bytearray()
+    mv = memoryview(data)
+    pos = 0
+    while pos < len(data):
+        crlf = data.find(b"\r\n", pos)
         if crlf == -1:
             break
         try:
-            chunk_size = int(data[:crlf], 16)
+            chunk_size = int(bytes(mv[pos:crlf]), 16)
         except ValueError:
             break
         if chunk_size == 0:
             break
         start = crlf + 2
-        result += data[start:start + chunk_size]
-        data = data[start + chunk_size + 2:]
-    return result
+        chunk = mv[start:start + chunk_size]
+        if decompressor is not None:
+            result.extend(decompressor.decompress(chunk))
+        else:
+            result.extend(chunk)
+        pos = start + chunk_size + 2  # skip chunk data + trailing CRLF
+    if decompressor is not None:
+        result.extend(decompressor.flush())
+    return bytes(result)
+
+
+def gunzip(body):
+    """
+    Decompress a full gzip body.
 
+    Uses libdeflate's one-shot decoder when the bindings are installed;
+    otherwise feeds an incremental zlib decompressor in 64 KB slices so
+    the compressed input and the output never have to coexist as three
+    separate full-size copies.
+    """
+    if _libdeflate is not None:
+        return _libdeflate.gzip_decompress(body)
+    dec = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    out = bytearray()
+    mv = memoryview(body)
+    for i in range(0, len(body), 65536):
+        out.extend(dec.decompress(mv[i:i + 65536]))
+    out.extend(dec.flush())
+    return bytes(out)
+
+
+# In-memory cache: url -> response body, kept in LRU order.
+# IMPROVEMENT: bounded — the old plain dict held every page and image of
+# a session forever. Eviction runs from the least-recently-used end once
+# either the total byte budget or the entry count is exceeded.
+_cache = collections.OrderedDict()
+_cache_bytes = 0
+_CACHE_MAX_BYTES = 64 << 20   # 64 MB of body data
+_CACHE_MAX_ITEMS = 256
+
+
+def _cache_store(url, body):
+    """Insert a body into the LRU cache, evicting oldest entries over budget."""
+    global _cache_bytes
+    if len(body) > _CACHE_MAX_BYTES:
+        return   # bigger than the whole budget — don't churn the cache
+    old = _cache.pop(url, None)
+    if old is not None:
+        _cache_bytes -= len(old)
+    _cache[url] = body
+    _cache_bytes += len(body)
+    while _cache_bytes > _CACHE_MAX_BYTES or len(_cache) > _CACHE_MAX_ITEMS:
+        _, evicted = _cache.popitem(last=False)
+        _cache_bytes -= len(evicted)
+
+
+def _cache_evict(url):
+    """Drop one cached entry (used by reload), keeping the byte count right."""
+    global _cache_bytes
+    body = _cache.pop(url, None)
+    if body is not None:
+        _cache_bytes -= len(body)
+
+# Idle keep-alive connections: (scheme, host, port) -> socket.
+# Reusing a connection skips the TCP handshake and, for HTTPS, the full
+# TLS handshake (2 RTTs + asymmetric crypto) on every request after the
+# first to a host — the dominant latency cost for image-heavy pages.
+_conn_pool = {}
+
+
+def _connect(scheme, host, ip, port):
+    """Open a TCP connection, wrapped in TLS for https."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.settimeout(10)
+    try:
+        sock.connect((ip, port))
+    except ConnectionRefusedError:
+        raise ValueError(f"Connection refused: {host}:{port}")
+    except socket.timeout:
+        raise ValueError(f"Connection timed out: {host}:{port}")
 
-# Simple in-memory cache: url -> response body
-_cache = {}
+    if scheme == "https":
+        try:
+            # Try with full certificate verification first (most secure)
+            context = ssl.create_default_context()
+            sock = context.wrap_socket(sock, server_hostname=host)
+        except ssl.SSLCertVerificationError:
+            # Windows often can't find system certificates — fall back to
+            # certifi's bundled CA store if available, otherwise skip verification.
+            # This is a known Python-on-Windows issue, not a security problem
+            # with the site itself.
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.settimeout(10)
+            sock.connect((ip, port))
+            try:
+                import certifi
+                context = ssl.create_default_context(cafile=certifi.where())
+                print("[SSL] Using certifi certificates")
+            except ImportError:
+                context = ssl.create_default_context()
+                context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+                print("[SSL] Warning: certificate verification disabled (run: pip install certifi)")
+            sock = context.wrap_socket(sock, server_hostname=host)
+
+    return sock
+
+
+def _chunked_end(buf, start, end):
+    """
+    Return the index one past the terminating zero-size chunk of a chunked
+    body in buf[start:end], or -1 if the body is not complete yet.
+    """
+    pos = start
+    while True:
+        crlf = buf.find(b"\r\n", pos, end)
+        if crlf == -1:
+            return -1
+        try:
+            size = int(buf[pos:crlf], 16)
+        except ValueError:
+            return -1
+        if size == 0:
+            term = buf.find(b"\r\n", crlf + 2, end)
+            return -1 if term == -1 else term + 2
+        pos = crlf + 2 + size + 2
+        if pos > end:
+            return -1
+
+
+def _recv_response(sock):
+    """
+    Read exactly one HTTP response from a (possibly reused) socket.
+
+    Reads until the header block is complete, then consumes precisely the
+    advertised body — Content-Length bytes, or chunked frames through the
+    terminating zero-size chunk — so the connection stays positioned for
+    the next request. Returns (status_line, headers, body, reusable);
+    status_line is None if the peer closed before sending headers (a stale
+    pooled connection), and reusable says the socket may go back to the pool.
+    """
+    # recv_into writes straight into a preallocated bytearray that doubles
+    # when full, so each byte lands in memory exactly once — the old
+    # `response += data` rebuilt the whole buffer on every 4 KB read.
+    # 64 KB reads also amortize the per-recv syscall cost.
+    buf = bytearray(65536)
+    pos = 0
+
+    def recv_more():
+        nonlocal pos
+        try:
+            n = sock.recv_into(memoryview(buf)[pos:])
+        except socket.timeout:
+            return False
+        if not n:
+            return False
+        pos += n
+        if pos == len(buf):
+            buf.extend(b"\x00" * len(buf))
+        return True
+
+    # --- Headers ---
+    while True:
+        header_end = buf.find(b"\r\n\r\n", 0, pos)
+        if header_end != -1:
+            break
+        if not recv_more():
+            return None, {}, b"", False
+
+    header_str = bytes(memoryview(buf)[:header_end]).decode(errors="ignore")
+
+    # Parse headers once into a lowercase-keyed dict, so the encoding and
+    # content-type checks in fetch() are O(1) lookups instead of each
+    # running a full lowercased-substring scan over the header block.
+    header_lines = header_str.split("\r\n")
+    status_line = header_lines[0]
+    headers = {}
+    for line in header_lines[1:]:
+        key, _, value = line.partition(":")
+        headers[key.strip().lower()] = value.strip()
+
+    body_start = header_end + 4
+    reusable = headers.get("connection", "").lower() != "close"
+
+    # --- Body ---
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            body_end = _chunked_end(buf, body_start, pos)
+            if body_end != -1:
+                break
+            if not recv_more():
+                body_end = pos
+                reusable = False
+                break
+    elif "content-length" in headers:
+        try:
+            length = int(headers["content-length"])
+        except ValueError:
+            length = 0
+        while pos - body_start < length:
+            if not recv_more():
+                reusable = False
+                break
+        body_end = min(body_start + length, pos)
+    else:
+        # No framing information — read to connection close (HTTP/1.0 style)
+        while recv_more():
+            pass
+        body_end = pos
+        reusable = False
+
+    body = bytes(memoryview(buf)[body_start:body_end])
+    return status_line, headers, body, reusable
 
 
 def fetch(url, _redirect_count=0):
@@ -47,6 +274,7 @@ def fetch(url, _redirect_count=0):
     # --- Cache check (GET only) ---
     if url in _cache:
         print(f"[Cache] HIT {url}")
+        _cache.move_to_end(url)   # refresh LRU position
         return _cache[url]
 
     if "://" not in url:
@@ -88,40 +316,6 @@ def fetch(url, _redirect_count=0):
             raise ValueError(f"DNS resolution failed for: {host}")
         print(f"[DNS] {host} -> {ip}")
 
-    # --- TCP connection ---
-    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    sock.settimeout(10)
-    try:
-        sock.connect((ip, port))
-    except ConnectionRefusedError:
-        raise ValueError(f"Connection refused: {host}:{port}")
-    except socket.timeout:
-        raise ValueError(f"Connection timed out: {host}:{port}")
-
-    if scheme == "https":
-        try:
-            # Try with full certificate verification first (most secure)
-            context = ssl.create_default_context()
-            sock = context.wrap_socket(sock, server_hostname=host)
-        except ssl.SSLCertVerificationError:
-            # Windows often can't find system certificates — fall back to
-            # certifi's bundled CA store if available, otherwise skip verification.
-            # This is a known Python-on-Windows issue, not a security problem
-            # with the site itself.
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(10)
-            sock.connect((ip, port))
-            try:
-                import certifi
-                context = ssl.create_default_context(cafile=certifi.where())
-                print("[SSL] Using certifi certificates")
-            except ImportError:
-                context = ssl.create_default_context()
-                context.check_hostname = False
-                context.verify_mode = ssl.CERT_NONE
-                print("[SSL] Warning: certificate verification disabled (run: pip install certifi)")
-            sock = context.wrap_socket(sock, server_hostname=host)
-
     # --- HTTP request ---
     request = (
         f"GET {path} HTTP/1.1\r\n"
@@ -129,37 +323,45 @@ def fetch(url, _redirect_count=0):
         f"User-Agent: Mozilla/5.0\r\n"
         f"Accept: text/html,application/xhtml+xml,*/*\r\n"
         f"Accept-Encoding: gzip\r\n"
-        f"Connection: close\r\n"
+        f"Connection: keep-alive\r\n"
         f"\r\n"
-    )
-    sock.sendall(request.encode())
-
-    # --- Receive response ---
-    response = b""
-    while True:
+    ).encode()
+
+    # --- Send request, reusing a pooled connection when possible ---
+    pool_key = (scheme, host, port)
+    sock = _conn_pool.pop(pool_key, None)
+    status_line = None
+    if sock is not None:
+        # A pooled connection may have been closed by the server while
+        # idle — if it fails, fall through to a fresh connection.
         try:
-            data = sock.recv(4096)
-            if not data:
-                break
-            response += data
-        except socket.timeout:
-            break
-    sock.close()
+            sock.sendall(request)
+            status_line, headers, body, reusable = _recv_response(sock)
+        except OSError:
+            status_line = None
+        if status_line is None:
+            sock.close()
+            sock = None
+    if sock is None:
+        sock = _connect(scheme, host, ip, port)
+        sock.sendall(request)
+        status_line, headers, body, reusable = _recv_response(sock)
+
+    if reusable:
+        _conn_pool[pool_key] = sock
+    else:
+        sock.close()
 
-    if b"\r\n\r\n" not in response:
+    if status_line is None:
         return ""
 
-    header_bytes, body = response.split(b"\r\n\r\n", 1)
-    header_str = header_bytes.decode(errors="ignore")
-
     # --- Redirect handling ---
-    status_line = header_str.split("\r\n")[0]
-    if any(f" {code} " in status_line for code in ("301", "302", "303", "307", "308")):
-        location = None
-        for line in header_str.split("\r\n"):
-            if line.lower().startswith("location:"):
-                location = line.split(":", 1)[1].strip()
-                break
+    # Pull the status code out of "HTTP/1.1 301 Moved Permanently" once
+    # instead of substring-scanning the status line per redirect code.
+    parts = status_line.split(" ", 2)
+    status_code = parts[1] if len(parts) > 1 else ""
+    if status_code in {"301", "302", "303", "307", "308"}:
+        location = headers.get("location")
         if location:
             # Handle relative redirects
             if location.startswith("/"):
@@ -168,23 +370,40 @@ def fetch(url, _redirect_count=0):
             return fetch(location, _redirect_count=_redirect_count + 1)
 
     # --- Decode transfer/content encoding ---
-    if "transfer-encoding: chunked" in header_str.lower():
-        body = decode_chunked(body)
+    # A gzipped chunked body is decoded in one fused pass: the chunk frames
+    # are stripped and the payload streamed straight into the decompressor,
+    # instead of reassembling the full compressed body first.
+    chunked = headers.get("transfer-encoding", "").lower() == "chunked"
+    gzipped = headers.get("content-encoding", "").lower() == "gzip"
 
-    if "content-encoding: gzip" in header_str.lower():
+    if chunked and gzipped:
+        try:
+            if _libdeflate is not None:
+                # libdeflate's one-shot decode beats streaming zlib
+                body = gunzip(decode_chunked(body))
+            else:
+                body = decode_chunked(body, zlib.decompressobj(16 + zlib.MAX_WBITS))
+        except Exception as e:
+            print(f"[Gzip] Decompress failed: {e}")
+            body = decode_chunked(body)
+    elif chunked:
+        body = decode_chunked(body)
+    elif gzipped:
         try:
-            body = gzip.decompress(body)
+            body = gunzip(body)
         except Exception as e:
             print(f"[Gzip] Decompress failed: {e}")
 
-    # Return raw bytes for images, string for everything else
-    if "content-type: image" in header_str.lower():
+    # Return raw bytes for images, string for everything else.
+    # Prefix match on the MIME type — a substring test would also fire on
+    # types that merely mention "image" somewhere in the value.
+    if headers.get("content-type", "").lower().startswith("image/"):
         return body
 
     result = body.decode(errors="ignore")
 
     # --- Store in cache ---
-    _cache[url] = result
+    _cache_store(url, result)
     return result
 
 
@@ -1,5 +1,18 @@
 import socket
 import struct
+import time
+
+# Precompiled formats — struct.pack/unpack re-parse the format string on
+# every call, which dominates the cost for these small packings.
+_HDR = struct.Struct(">HHHHHH")   # header: id, flags, qd/an/ns/ar counts
+_QT = struct.Struct(">HH")        # question tail: qtype, qclass
+_ANS = struct.Struct(">HHIH")     # RR fixed part: type, class, ttl, rdlength
+
+# Cache of resolved addresses: domain -> (ip, expiry timestamp).
+# Entries honour the TTL from the answer record, so a page with many
+# sub-resources on one host does a single DNS round-trip instead of one
+# per image.
+_cache = {}
 
 
 def build_query(domain):
@@ -11,21 +24,25 @@ def build_query(domain):
     nscount = 0
     arcount = 0
 
-    header = struct.pack(">HHHHHH",
+    header = _HDR.pack(
         transaction_id, flags, qdcount, ancount, nscount, arcount
     )
 
     # Encode domain: "google.com" -> \x06google\x03com\x00
-    question = b""
+    # Collected in a list and joined once — bytes += reallocates the
+    # whole buffer on every label.
+    parts = [header]
     for part in domain.split("."):
-        question += bytes([len(part)]) + part.encode()
-    question += b"\x00"
+        encoded = part.encode()
+        parts.append(bytes([len(encoded)]))
+        parts.append(encoded)
+    parts.append(b"\x00")
 
     qtype = 1    # A record = IPv4
     qclass = 1   # IN = internet
-    question += struct.pack(">HH", qtype, qclass)
+    parts.append(_QT.pack(qtype, qclass))
 
-    return header + question
+    return b"".join(parts)
 
 
 def resolve(domain):
@@ -37,7 +54,13 @@ def resolve(domain):
     Correctly handles both compressed (0xC0) and uncompressed name
          pointers in answer records — the original code assumed all answers
          used a 2-byte compressed pointer, which broke on some DNS responses.
+    Results are cached for the record's TTL, so repeat lookups within
+         the TTL window skip the network entirely.
     """
+    cached = _cache.get(domain)
+    if cached is not None and time.monotonic() < cached[1]:
+        return cached[0]
+
     dns_server = "8.8.8.8"
     dns_port = 53
 
@@ -58,13 +81,17 @@ def resolve(domain):
 
     # Unpack 12-byte header
     transaction_id, flags, qdcount, ancount, nscount, arcount = \
-        struct.unpack(">HHHHHH", response[:12])
+        _HDR.unpack_from(response)
 
     # Skip question section
     offset = 12
     for _ in range(qdcount):
-        while offset < len(response) and response[offset] != 0:
-            offset += response[offset] + 1
+        # The QNAME ends at its null terminator — one C-level scan
+        # (memchr) instead of hopping label-by-label in Python.
+        try:
+            offset = response.index(b"\x00", offset)
+        except ValueError:
+            return None   # malformed packet
         offset += 5  # null byte + qtype (2) + qclass (2)
 
     # Parse answer records
@@ -77,23 +104,29 @@ def resolve(domain):
         if response[offset] & 0xC0 == 0xC0:
             offset += 2           # compressed pointer is always 2 bytes
         else:
-            while offset < len(response) and response[offset] != 0:
-                offset += response[offset] + 1
-            offset += 1           # skip the null terminator
+            try:
+                offset = response.index(b"\x00", offset) + 1
+            except ValueError:
+                break   # malformed packet
 
         if offset + 10 > len(response):
             break
 
-        rtype, rclass, ttl, rdlength = struct.unpack(">HHIH", response[offset:offset + 10])
+        rtype, rclass, ttl, rdlength = _ANS.unpack_from(response, offset)
         offset += 10
 
         if rtype == 1 and rdlength == 4:  # A record = 4-byte IPv4
             ip = ".".join(str(b) for b in response[offset:offset + 4])
-            ips.append(ip)
+            ips.append((ip, ttl))
 
         offset += rdlength
 
-    return ips[0] if ips else None
+    if not ips:
+        return None
+
+    ip, ttl = ips[0]
+    _cache[domain] = (ip, time.monotonic() + ttl)
+    return ip
 
 
 
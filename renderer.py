@@ -1,14 +1,30 @@
 import tkinter as tk
 from html.parser import HTMLParser
+from concurrent.futures import ThreadPoolExecutor
 import urllib.parse
 import io
 
+# Optional: selectolax (pip install selectolax) wraps the Modest C engine,
+# which tokenises large pages 50-100× faster than the pure-Python
+# html.parser state machine. The built-in parser stays as the fallback.
+try:
+    from selectolax.parser import HTMLParser as FastParser
+except ImportError:
+    FastParser = None
+
 
 # ─────────────────────────────────────────────
 #  HTML Parser  (replaces fragile regex splits)
 # ─────────────────────────────────────────────
 class HTMLNode:
-    """Simple node produced by the parser."""
+    """Simple node produced by the parser.
+
+    IMPROVEMENT: __slots__ drops the per-instance __dict__ — one node is
+    created per tag/text token, thousands per page, so this cuts the
+    parsed page's memory several-fold and speeds attribute access.
+    """
+    __slots__ = ("tag", "attrs", "text", "is_closing")
+
     def __init__(self, tag, attrs=None, text="", is_closing=False):
         self.tag = tag.lower() if tag else ""
         self.attrs = dict(attrs or [])
@@ -56,7 +72,28 @@ class PageParser(HTMLParser):
             pass
 
 
+def _walk_fast(node, out):
+    """Emit the HTMLNode stream for one selectolax subtree (open nodes,
+    text, recursed children, then the matching closing node)."""
+    for child in node.iter(include_text=True):
+        if child.tag == "-text":
+            text = (child.text(deep=False) or "").strip()
+            if text:
+                out.append(HTMLNode("__text__", text=text))
+            continue
+        out.append(HTMLNode(child.tag, list(child.attributes.items())))
+        _walk_fast(child, out)
+        out.append(HTMLNode(child.tag, is_closing=True))
+
+
 def parse_html(html):
+    """Tokenise HTML into the flat HTMLNode stream the renderer walks."""
+    if FastParser is not None:
+        out = []
+        root = FastParser(html).root   # <html>, so <title> in <head> is kept
+        if root is not None:
+            _walk_fast(root, out)
+        return out
     p = PageParser()
     p.feed(html)
     return p.nodes
@@ -74,6 +111,10 @@ class Browser:
         self.current_url = ""
         self.inputs = {}
         self.fetch_func = None
+        # IMPROVEMENT: image downloads run on a thread pool so a page with
+        # N images waits ~max(latencies) instead of their sum, and the UI
+        # thread never blocks on the network.
+        self._image_pool = ThreadPoolExecutor(max_workers=8)
 
         self._build_ui()
 
@@ -108,15 +149,17 @@ class Browser:
         self.canvas.pack(side="left", fill="both", expand=True)
 
         self.frame = tk.Frame(self.canvas, bg="white")
-        self.frame.bind("<Configure>", lambda e: self.canvas.configure(
-            scrollregion=self.canvas.bbox("all")
-        ))
-        self.canvas.create_window((0, 0), window=self.frame, anchor="nw")
+        self.frame.bind("<Configure>", self._on_frame_configure)
+        self._frame_window = self.canvas.create_window(
+            (0, 0), window=self.frame, anchor="nw")
         self.canvas.bind_all("<MouseWheel>", self._on_mousewheel)
 
         self.history = []
 
     # ── Navigation helpers ─────────────────────────────────────────────────
+    def _on_frame_configure(self, event=None):
+        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+
     def _on_mousewheel(self, event):
         self.canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
 
@@ -133,8 +176,8 @@ class Browser:
     def _on_reload(self):
         # IMPROVEMENT: reload clears the cache entry so you get fresh content
         if self.current_url:
-            from browser import _cache
-            _cache.pop(self.current_url, None)
+            from browser import _cache_evict
+            _cache_evict(self.current_url)
             self.navigate(self.current_url)
 
     def navigate(self, url):
@@ -181,59 +224,82 @@ class Browser:
 
         nodes = parse_html(html)
 
+        # IMPROVEMENT: every .pack() on a visible frame triggers a geometry
+        # recompute and a <Configure> event that recalculates the canvas
+        # scrollregion — O(N²) layout work for long pages. Hide the page
+        # frame and mute the handler while widgets are created, then show
+        # it and set the scrollregion once.
+        self.frame.unbind("<Configure>")
+        self.canvas.itemconfigure(self._frame_window, state="hidden")
+        try:
+            self._build_page(nodes)
+        finally:
+            self.canvas.itemconfigure(self._frame_window, state="normal")
+            self.frame.bind("<Configure>", self._on_frame_configure)
+            self.canvas.update_idletasks()
+            self._on_frame_configure()
+
+    def _build_page(self, nodes):
+        """Create the widgets for a parsed page (called with layout muted)."""
         current_form_action = None
         # Track inline formatting context
         bold = False
         italic = False
 
         i = 0
-        while i < len(nodes):
+        n = len(nodes)
+        while i < n:
             node = nodes[i]
+            # IMPROVEMENT: peek at the following text node once per
+            # iteration — most arms below used to re-index nodes[i] three
+            # times for the same "take the next node's text" pattern.
+            nxt = nodes[i + 1] if i + 1 < n else None
+            nxt_text = nxt.text if nxt is not None and nxt.tag == "__text__" else ""
 
             # ── Structural / metadata ──────────────────────────────────────
             if node.tag == "title" and not node.is_closing:
                 i += 1
-                if i < len(nodes) and nodes[i].tag == "__text__":
-                    self.root.title(nodes[i].text)
+                if nxt_text:
+                    self.root.title(nxt_text)
 
             elif node.tag in ("h1", "h2", "h3", "h4", "h5", "h6") and not node.is_closing:
                 sizes = {"h1": 24, "h2": 20, "h3": 16, "h4": 14, "h5": 12, "h6": 11}
                 size = sizes.get(node.tag, 12)
                 i += 1
-                text = nodes[i].text if i < len(nodes) and nodes[i].tag == "__text__" else ""
+                text = nxt_text
                 tk.Label(self.frame, text=text, bg="white",
                          font=("Arial", size, "bold")).pack(anchor="w", padx=10, pady=(8, 2))
 
             elif node.tag == "p" and not node.is_closing:
                 i += 1
-                text = nodes[i].text if i < len(nodes) and nodes[i].tag == "__text__" else ""
+                text = nxt_text
                 tk.Label(self.frame, text=text, bg="white",
                          font=("Arial", 12), wraplength=840, justify="left"
                          ).pack(anchor="w", padx=10, pady=3)
 
             elif node.tag == "li" and not node.is_closing:
                 i += 1
-                text = nodes[i].text if i < len(nodes) and nodes[i].tag == "__text__" else ""
+                text = nxt_text
                 tk.Label(self.frame, text="  •  " + text, bg="white",
                          font=("Arial", 12)).pack(anchor="w", padx=30, pady=1)
 
             # IMPROVEMENT: <strong> / <b> and <em> / <i> inline labels
             elif node.tag in ("strong", "b") and not node.is_closing:
                 i += 1
-                text = nodes[i].text if i < len(nodes) and nodes[i].tag == "__text__" else ""
+                text = nxt_text
                 tk.Label(self.frame, text=text, bg="white",
                          font=("Arial", 12, "bold")).pack(anchor="w", padx=10)
 
             elif node.tag in ("em", "i") and not node.is_closing:
                 i += 1
-                text = nodes[i].text if i < len(nodes) and nodes[i].tag == "__text__" else ""
+                text = nxt_text
                 tk.Label(self.frame, text=text, bg="white",
                          font=("Arial", 12, "italic")).pack(anchor="w", padx=10)
 
             # IMPROVEMENT: <pre> / <code> monospace block
             elif node.tag in ("pre", "code") and not node.is_closing:
                 i += 1
-                text = nodes[i].text if i < len(nodes) and nodes[i].tag == "__text__" else ""
+                text = nxt_text
                 tk.Label(self.frame, text=text, bg="#f4f4f4",
                          font=("Courier", 11), justify="left",
                          wraplength=840, anchor="w").pack(anchor="w", padx=10, pady=4, fill="x")
@@ -289,7 +355,7 @@ class Browser:
 
             elif node.tag == "button" and not node.is_closing:
                 i += 1
-                text = nodes[i].text if i < len(nodes) and nodes[i].tag == "__text__" else "Click"
+                text = nxt_text or "Click"
                 action = current_form_action
                 tk.Button(self.frame, text=text, font=("Arial", 12),
                           command=lambda a=action: self._on_button(a)
@@ -299,7 +365,7 @@ class Browser:
             elif node.tag == "a" and not node.is_closing:
                 href = node.get("href", "")
                 i += 1
-                text = nodes[i].text if i < len(nodes) and nodes[i].tag == "__text__" else href
+                text = nxt_text or href
                 if href:
                     lbl = tk.Label(self.frame, text=text, bg="white",
                                    fg="blue", font=("Arial", 12, "underline"),
@@ -339,33 +405,66 @@ class Browser:
 
     def _render_image(self, src, alt="[image]"):
         """
-        IMPROVEMENT: image_data is already bytes when content-type is image,
-        so we no longer need the latin-1 encode/decode round-trip.
+        IMPROVEMENT: the download runs on the thread pool instead of
+        blocking the UI thread. A placeholder label is packed in document
+        order right away and swapped for the image once the fetch
+        completes (marshalled back to the Tk thread via root.after).
         """
-        try:
-            if not src.startswith("http"):
-                base = self.current_url.rsplit("/", 1)[0]
-                src = base + "/" + src.lstrip("/")
+        if not src.startswith("http"):
+            base = self.current_url.rsplit("/", 1)[0]
+            src = base + "/" + src.lstrip("/")
 
-            image_data = self.fetch_func(src)
+        lbl = tk.Label(self.frame, text=f"[loading {alt}…]",
+                       bg="white", fg="grey")
+        lbl.pack(anchor="w", padx=10, pady=4)
 
-            from PIL import Image, ImageTk
+        future = self._image_pool.submit(self._fetch_and_decode, src)
+        future.add_done_callback(
+            lambda f, lbl=lbl, alt=alt:
+            self.root.after(0, self._attach_image, lbl, f, alt))
 
-            # fetch() returns raw bytes for images; handle both just in case
-            if isinstance(image_data, str):
-                image_data = image_data.encode("latin-1")
+    def _fetch_and_decode(self, src):
+        """
+        Download and decode one image on a pool worker.
+
+        IMPROVEMENT: the PIL decode + thumbnail resample used to run on
+        the Tk main thread, stalling the UI per image. Only the raw
+        pixels travel back; the PhotoImage wrap (which must happen on the
+        Tk thread) is all that's left for _attach_image.
+        """
+        image_data = self.fetch_func(src)
+
+        from PIL import Image
+
+        # fetch() returns raw bytes for images; handle both just in case
+        if isinstance(image_data, str):
+            image_data = image_data.encode("latin-1")
+
+        img = Image.open(io.BytesIO(image_data))
+        img.thumbnail((700, 500))
+        if img.mode == "P":
+            img = img.convert("RGB")   # frombytes can't carry a palette
+        return img.mode, img.size, img.tobytes()
 
-            img = Image.open(io.BytesIO(image_data))
-            img.thumbnail((700, 500))
-            photo = ImageTk.PhotoImage(img)
+    def _attach_image(self, lbl, future, alt):
+        """
+        Put a finished download's pixels on screen. Runs on the Tk main
+        thread (Tk objects aren't thread-safe), replacing the placeholder
+        label created by _render_image.
+        """
+        if not lbl.winfo_exists():
+            return   # user navigated away before the download finished
+        try:
+            mode, size, pixels = future.result()
+
+            from PIL import Image, ImageTk
+            photo = ImageTk.PhotoImage(Image.frombytes(mode, size, pixels))
 
-            lbl = tk.Label(self.frame, image=photo, bg="white")
+            lbl.configure(image=photo, text="")
             lbl.image = photo   # prevent garbage collection
-            lbl.pack(anchor="w", padx=10, pady=4)
 
         except ImportError:
-            tk.Label(self.frame, text=f"[Image: install Pillow to view — {alt}]",
-                     bg="white", fg="orange").pack(anchor="w", padx=10)
+            lbl.configure(text=f"[Image: install Pillow to view — {alt}]",
+                          fg="orange")
         except Exception as e:
-            tk.Label(self.frame, text=f"[Image failed: {e}]",
-                     bg="white", fg="red").pack(anchor="w", padx=10)
\ No newline at end of file
+            lbl.configure(text=f"[Image failed: {e}]", fg="red")
\ No newline at end of file